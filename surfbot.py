@@ -5,27 +5,52 @@ Optimized for weekend warriors with PTO alerts
 """
 
 import os
+import sys
+import atexit
+import signal
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import re
 import time
+import random
 import threading
-import schedule
-from datetime import datetime, timedelta
-import pytz
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import secrets
+import hmac
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from datetime import date, datetime, timedelta, timezone, time as dt_time
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    from backports.zoneinfo import ZoneInfo
 import json
+import functools
+import sqlite3
+import bisect
+from dataclasses import dataclass, field
+from typing import NamedTuple
 
 # ============== CONFIGURATION ==============
 
 TELEGRAM_TOKEN = os.getenv("SURFBOT_TOKEN", "YOUR_BOT_TOKEN_HERE")
 TELEGRAM_CHAT_ID = os.getenv("SURFBOT_CHAT_ID", "1552583800")
 
+# Webhook mode: set to the public HTTPS URL Telegram should POST updates to
+# (e.g. behind a reverse proxy forwarding to WEBHOOK_PORT). Unset = long-poll.
+WEBHOOK_URL = os.getenv("SURFBOT_WEBHOOK_URL", "")
+WEBHOOK_PORT = int(os.getenv("SURFBOT_WEBHOOK_PORT", "8443"))
+
 SPOTS = [
     {"name": "Annenberg/SM Pier", "slug": "Santa-Monica-Pier"},
     {"name": "Venice/Muscle Beach", "slug": "Venice-Breakwater"},
 ]
 
-TZ = pytz.timezone("America/Los_Angeles")
+TZ = ZoneInfo("America/Los_Angeles")
 
 # Weekend = detailed, weekdays = condensed with PTO flags
 WEEKEND_PRIORITY = True
@@ -55,6 +80,14 @@ HEAT_THRESHOLD_F = 90
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 HOME_ADDRESS = "Glendale, CA"  # Origin for commute calculations
 
+# On-disk cache for drive times - traffic at 9am Tuesday looks like last
+# Tuesday at 9am, so results are reused for a week per (beach, weekday, hour)
+CACHE_PATH = os.path.expanduser(os.getenv("SURFBOT_CACHE", "~/.surfbot-cache.sqlite"))
+COMMUTE_CACHE_TTL = 7 * 24 * 3600
+
+# In-memory forecast/weather cache is snapshotted here on shutdown
+CACHE_SNAPSHOT_PATH = os.path.expanduser(os.getenv("SURFBOT_CACHE_SNAPSHOT", "~/.surfbot_cache.json"))
+
 # Beaches with addresses for commute calculation
 BEACH_ADDRESSES = {
     "carp": "Carpinteria State Beach, Carpinteria, CA",
@@ -158,80 +191,363 @@ DAILY_HOUR = 6
 TICKER_START = 6
 TICKER_END = 18
 
+# ============== LOGGING ==============
+
+# Handlers write from a listener thread; callers (the long-poll loop
+# included) only enqueue a record and never block on stderr
+_LOG_QUEUE = queue.Queue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(threadName)s: %(message)s"))
+_log_listener = QueueListener(_LOG_QUEUE, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes whatever is still queued
+
+log = logging.getLogger("surfbot")
+log.addHandler(QueueHandler(_LOG_QUEUE))
+log.setLevel(logging.INFO)
+log.propagate = False
+
+# ============== HTTP ==============
+
+# One pooled session so repeated calls to Telegram, surf-forecast.com,
+# Open-Meteo and Google Maps reuse keep-alive connections instead of a fresh
+# TLS handshake. Transient 429/5xx on GETs are retried with backoff.
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+SESSION.headers["User-Agent"] = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+def fan_out(fn, args_list, max_workers=8):
+    """
+    Run fn(*args) for each args tuple on a short-lived thread pool.
+    Everything here is network-bound, so threads overlap the waits.
+    Returns results in the same order as args_list.
+    """
+    if not args_list:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(args_list))) as pool:
+        return list(pool.map(lambda args: fn(*args), args_list))
+
+def gather(*calls):
+    """Run zero-argument callables concurrently, results in call order"""
+    return fan_out(lambda call: call(), [(call,) for call in calls])
+
+# ============== CACHING ==============
+
+# Forecasts only update every few hours, so scheduled reports and ad-hoc
+# commands within the TTL window share one fetch instead of re-scraping
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+# Calls currently in progress, so overlapping jobs (e.g. the 6 AM daily
+# report and the 6 AM hourly blast) share one request per key
+_INFLIGHT = {}
+
+def ttl_cache(seconds, normalize=None):
+    """
+    Memoize a fetcher by its positional args for `seconds`.
+    Get-or-generate: a fresh cached value is returned, otherwise callers
+    with the same args wait on one in-progress call rather than each
+    fetching. Empty/failed results are not cached. Call with force=True
+    to bypass the cache and store a fresh value.
+    normalize(*args) -> args, if given, canonicalizes the args before both
+    the lookup and the call, so near-identical requests share an entry.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, force=False):
+            if normalize:
+                args = normalize(*args)
+            key = (fn.__name__, args)
+            with _CACHE_LOCK:
+                hit = _CACHE.get(key)
+                if not force and hit and hit[0] > time.monotonic():
+                    return hit[1]
+                future = _INFLIGHT.get(key)
+                owner = future is None
+                if owner:
+                    future = _INFLIGHT[key] = Future()
+
+            if not owner:
+                return future.result()
+
+            value = None
+            try:
+                value = fn(*args)
+            except BaseException as e:
+                # Waiters get the error too (SystemExit included) rather
+                # than blocking on a future nobody will resolve
+                future.set_exception(e)
+                raise
+            finally:
+                with _CACHE_LOCK:
+                    if value:
+                        _CACHE[key] = (time.monotonic() + seconds, value)
+                    _INFLIGHT.pop(key, None)
+            future.set_result(value)
+            return value
+        return wrapper
+    return decorator
+
+def _as_key(value):
+    """JSON round-trips tuples as lists; turn them back into hashable tuples"""
+    if isinstance(value, list):
+        return tuple(_as_key(v) for v in value)
+    return value
+
+def _code_fingerprint():
+    """Identifies this version of the bot so snapshots don't outlive a deploy"""
+    st = os.stat(__file__)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def save_cache():
+    """Write unexpired cache entries to CACHE_SNAPSHOT_PATH for a warm restart"""
+    now_mono, now_wall = time.monotonic(), time.time()
+    with _CACHE_LOCK:
+        entries = [
+            [name, args, now_wall + (expires - now_mono), value]
+            for (name, args), (expires, value) in _CACHE.items()
+            if expires > now_mono
+        ]
+    try:
+        tmp = CACHE_SNAPSHOT_PATH + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"code": _code_fingerprint(), "entries": entries}, f)
+        os.replace(tmp, CACHE_SNAPSHOT_PATH)
+    except Exception as e:
+        log.error("Cache save error: %s", e)
+
+def load_cache():
+    """Reload entries written by save_cache that haven't expired yet"""
+    try:
+        with open(CACHE_SNAPSHOT_PATH) as f:
+            snapshot = json.load(f)
+        # A different surfbot.py may cache differently shaped data - start cold
+        if snapshot.get("code") != _code_fingerprint():
+            return
+        entries = snapshot["entries"]
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        log.error("Cache load error: %s", e)
+        return
+
+    now_mono, now_wall = time.monotonic(), time.time()
+    with _CACHE_LOCK:
+        for name, args, expires_wall, value in entries:
+            if expires_wall > now_wall:
+                _CACHE[(name, _as_key(args))] = (now_mono + expires_wall - now_wall, value)
+
 # ============== TELEGRAM ==============
 
+# (connect, read) timeouts. Polls and sends share SESSION's pool, so a
+# long-poll parked on one keep-alive socket never blocks a send on another;
+# a short connect timeout makes a dead network fail fast either way.
+TELEGRAM_SEND_TIMEOUT = (5, 10)
+TELEGRAM_POLL_TIMEOUT = (10, 60)
+
+# Telegram sends chat ids as JSON ints; compare against one parsed up front
+_AUTH_CHAT_ID = int(TELEGRAM_CHAT_ID)
+
+# getUpdates body for a poll that timed out with nothing new
+_NO_UPDATES = b'"result":[]'
+
+_TG_SEND_URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
+_TG_UPDATES_URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getUpdates"
+_TG_WEBHOOK_URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/setWebhook"
+_TG_DELETE_WEBHOOK_URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/deleteWebhook"
+
+# Messages go out from one background thread, so a slow Telegram API or a
+# 429 backoff never holds up the scheduler or the command listener
+_SEND_QUEUE = queue.Queue(maxsize=100)
+
 def send(msg):
     try:
-        requests.post(
-            f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage",
-            json={"chat_id": TELEGRAM_CHAT_ID, "text": msg, "parse_mode": "HTML"},
-            timeout=10
+        _SEND_QUEUE.put_nowait(msg)
+    except queue.Full:
+        log.error("Telegram error: send queue full, dropping message")
+
+def _post_message(msg):
+    """POST one message. Returns seconds to wait before retrying, or None when done."""
+    try:
+        r = SESSION.post(
+            _TG_SEND_URL,
+            data={
+                "chat_id": TELEGRAM_CHAT_ID,
+                "text": msg,
+                "parse_mode": "HTML",
+                "disable_web_page_preview": "true",
+            },
+            timeout=TELEGRAM_SEND_TIMEOUT
         )
+        if r.status_code == 429:
+            return r.json().get("parameters", {}).get("retry_after", 5)
     except Exception as e:
-        print(f"Telegram error: {e}")
+        log.error("Telegram error: %s", e)
+    return None
+
+# Telegram allows about one message a second into a single chat
+SEND_INTERVAL = 1.0
+
+def _send_worker():
+    last_post = 0.0
+    while True:
+        msg = _SEND_QUEUE.get()
+        wait = last_post + SEND_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        # Rate limited - wait as told and retry this message so order is kept
+        while (retry_after := _post_message(msg)) is not None:
+            time.sleep(retry_after)
+        last_post = time.monotonic()
+        _SEND_QUEUE.task_done()
+
+threading.Thread(target=_send_worker, daemon=True).start()
+
+def flush_sends(timeout=10):
+    """Wait (up to timeout seconds) for queued messages to go out"""
+    deadline = time.monotonic() + timeout
+    with _SEND_QUEUE.all_tasks_done:
+        while _SEND_QUEUE.unfinished_tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log.error("Telegram error: %d queued messages not sent", _SEND_QUEUE.unfinished_tasks)
+                return
+            _SEND_QUEUE.all_tasks_done.wait(remaining)
+
+# The worker is a daemon thread, so give it a chance to drain before exit
+atexit.register(flush_sends)
 
 # ============== COMMUTE TIMES ==============
 
+DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+
+def fetch_drive_times(origins, destinations):
+    """
+    One Distance Matrix call covering every origin x destination pair.
+    Returns a grid of duration text: grid[origin_idx][dest_idx], "?" if unavailable.
+    """
+    grid = [["?"] * len(destinations) for _ in origins]
+    params = {
+        "origins": "|".join(origins),
+        "destinations": "|".join(destinations),
+        "departure_time": "now",
+        "key": GOOGLE_MAPS_API_KEY,
+    }
+    try:
+        r = SESSION.get(DISTANCE_MATRIX_URL, params=params, timeout=10)
+        data = r.json()
+
+        if data.get("status") != "OK":
+            log.error("Distance Matrix error: %s %s", data.get('status'), data.get('error_message', ''))
+            return grid
+
+        for i, row in enumerate(data.get("rows", [])[:len(origins)]):
+            for j, elem in enumerate(row.get("elements", [])[:len(destinations)]):
+                if elem.get("status") != "OK":  # e.g. NOT_FOUND, ZERO_RESULTS
+                    continue
+                if elem.get("duration_in_traffic"):
+                    grid[i][j] = elem["duration_in_traffic"]["text"]
+                elif elem.get("duration"):
+                    grid[i][j] = elem["duration"]["text"]
+    except Exception as e:
+        log.error("Commute error: %s", e)
+    return grid
+
+_commute_db = None
+_COMMUTE_DB_LOCK = threading.Lock()
+
+def _commute_cache():
+    """Lazily open the sqlite commute cache, or None if it can't be opened"""
+    global _commute_db
+    if _commute_db is None:
+        try:
+            db = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS commute "
+                "(key TEXT PRIMARY KEY, to_time TEXT, back_time TEXT, expires REAL)"
+            )
+            _commute_db = db
+        except Exception as e:
+            log.error("Commute cache error: %s", e)
+    return _commute_db
+
+def commute_cache_get(key):
+    db = _commute_cache()
+    if db is None:
+        return None
+    try:
+        with _COMMUTE_DB_LOCK:
+            row = db.execute(
+                "SELECT to_time, back_time FROM commute WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            ).fetchone()
+    except sqlite3.Error as e:
+        # Locked/corrupt/unreadable - just fetch fresh
+        log.error("Commute cache error: %s", e)
+        return None
+    return {"to": row[0], "back": row[1]} if row else None
+
+def commute_cache_set(key, times):
+    db = _commute_cache()
+    if db is None:
+        return
+    try:
+        with _COMMUTE_DB_LOCK, db:
+            db.execute(
+                "INSERT OR REPLACE INTO commute VALUES (?, ?, ?, ?)",
+                (key, times["to"], times["back"], time.time() + COMMUTE_CACHE_TTL),
+            )
+    except sqlite3.Error as e:
+        # Locked, read-only or full disk - skip the write, the result still stands
+        log.error("Commute cache error: %s", e)
+
+def _destinations_key(destinations=None):
+    # Lists are unhashable - cache on a tuple so callers can pass either
+    return (tuple(destinations) if destinations is not None else None,)
+
+@ttl_cache(600, normalize=_destinations_key)  # Traffic changes quickly
 def get_commute_times(destinations=None):
     """
     Get drive times from home to beaches and back using Google Distance Matrix API.
+    Served from the on-disk cache when we have this weekday/hour already;
+    otherwise two batched requests: home -> beaches, beaches -> home.
     Returns dict: {beach_code: {"to": "1h 15m", "back": "1h 05m"}}
     """
     if not GOOGLE_MAPS_API_KEY:
         return {}
 
     if destinations is None:
-        destinations = ["carp", "paradise", "belmont"]  # Default top 3
-
-    results = {}
-
-    for code in destinations:
-        if code not in BEACH_ADDRESSES:
-            continue
-
-        beach_addr = BEACH_ADDRESSES[code]
+        destinations = ("carp", "paradise", "belmont")  # Default top 3
 
-        try:
-            # Drive TO beach
-            url = "https://maps.googleapis.com/maps/api/distancematrix/json"
-            params = {
-                "origins": HOME_ADDRESS,
-                "destinations": beach_addr,
-                "departure_time": "now",
-                "key": GOOGLE_MAPS_API_KEY,
-            }
-            r = requests.get(url, params=params, timeout=10)
-            data = r.json()
-
-            to_duration = "?"
-            if data.get("rows") and data["rows"][0].get("elements"):
-                elem = data["rows"][0]["elements"][0]
-                if elem.get("duration_in_traffic"):
-                    to_duration = elem["duration_in_traffic"]["text"]
-                elif elem.get("duration"):
-                    to_duration = elem["duration"]["text"]
-
-            # Drive BACK from beach
-            params["origins"] = beach_addr
-            params["destinations"] = HOME_ADDRESS
-            r = requests.get(url, params=params, timeout=10)
-            data = r.json()
-
-            back_duration = "?"
-            if data.get("rows") and data["rows"][0].get("elements"):
-                elem = data["rows"][0]["elements"][0]
-                if elem.get("duration_in_traffic"):
-                    back_duration = elem["duration_in_traffic"]["text"]
-                elif elem.get("duration"):
-                    back_duration = elem["duration"]["text"]
+    codes = [c for c in destinations if c in BEACH_ADDRESSES]
+    now = datetime.now(TZ)
+    keys = {c: f"{HOME_ADDRESS}|{c}|{now.weekday()}|{now.hour}" for c in codes}
 
-            results[code] = {"to": to_duration, "back": back_duration}
+    cached = {c: commute_cache_get(keys[c]) for c in codes}
+    missing = [c for c in codes if cached[c] is None]
 
-        except Exception as e:
-            print(f"Commute error for {code}: {e}")
-            results[code] = {"to": "?", "back": "?"}
+    if missing:
+        addresses = [BEACH_ADDRESSES[c] for c in missing]
+        to_grid, back_grid = fan_out(fetch_drive_times, [
+            ([HOME_ADDRESS], addresses),  # Drive TO beaches
+            (addresses, [HOME_ADDRESS]),  # Drive BACK from beaches
+        ])
+        for i, code in enumerate(missing):
+            times = {"to": to_grid[0][i], "back": back_grid[i][0]}
+            cached[code] = times
+            if "?" not in times.values():
+                commute_cache_set(keys[code], times)
 
-    return results
+    return {c: cached[c] for c in codes}
 
 # ============== TEMPERATURE HELPERS ==============
 
@@ -239,90 +555,108 @@ def c_to_f(c):
     """Convert Celsius to Fahrenheit"""
     return round(c * 9/5 + 32)
 
-def f_to_c(f):
-    """Convert Fahrenheit to Celsius"""
-    return round((f - 32) * 5/9)
-
-def format_temp(celsius=None, fahrenheit=None):
-    """Format temperature as 'X°C (Y°F)' - Celsius primary"""
-    if celsius is not None:
-        c = round(celsius)
-        f = c_to_f(celsius)
-    elif fahrenheit is not None:
-        f = round(fahrenheit)
-        c = f_to_c(fahrenheit)
-    else:
-        return "?"
-    return f"{c}°C ({f}°F)"
+@functools.lru_cache(maxsize=128)  # Open-Meteo readings are 1-decimal, so they repeat a lot
+def _format_temp_c(celsius):
+    """Format a Celsius reading as 'X°C (Y°F)' - Celsius primary"""
+    return f"{round(celsius)}°C ({c_to_f(celsius)}°F)"
+
+def _weather_temp(weather, key, missing="?"):
+    """Formatted fetch_weather reading, or `missing` when there isn't one"""
+    if weather and weather.get(key):
+        return _format_temp_c(weather[key])
+    return missing
+
+# Wetsuit by water temp: below 14°C full 4/3, below 17 a 3/2, below 20 spring
+_SUIT_THRESHOLDS_C = (14, 17, 20)
+_SUIT_LABELS = ("Full 4/3 wetsuit", "3/2 wetsuit", "Spring suit", "Trunks OK")
+
+# Surf report wording, by whole °F: below 60 a 4/3, below 65 a 3/2, below 70 spring
+_SURF_SUIT_THRESHOLDS_F = (60, 65, 70)
+_SURF_SUIT_LABELS = ("full 4/3", "3/2", "spring", "trunks")
 
 # ============== WEATHER API (Open-Meteo - Free, No API Key) ==============
 
+MARINE_URL = "https://marine-api.open-meteo.com/v1/marine"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Open-Meteo "current" variable -> our result key. Only these are requested,
+# and without timezone=auto, so the response is just the current block
+_MARINE_FIELDS = {"sea_surface_temperature": "water_temp_c"}
+_FORECAST_FIELDS = {
+    "temperature_2m": "air_temp_c",
+    "wind_speed_10m": "wind_speed_kmh",
+    "wind_direction_10m": "wind_dir",
+}
+
+def _fetch_current(url, lat, lon, fields):
+    """Read the requested current values from an Open-Meteo endpoint"""
+    params = {"latitude": lat, "longitude": lon, "current": ",".join(fields)}
+    r = SESSION.get(url, params=params, timeout=10)
+    current = r.json().get("current")
+    if not current:
+        return {}
+    return {key: current.get(name) for name, key in fields.items()}
+
+def _fetch_marine(lat, lon):
+    """Water temp from the Open-Meteo marine API"""
+    try:
+        return _fetch_current(MARINE_URL, lat, lon, _MARINE_FIELDS)
+    except Exception as e:
+        log.error("Marine API error: %s", e)
+    return {}
+
+def _fetch_forecast(lat, lon):
+    """Air temp and wind from the Open-Meteo forecast API"""
+    try:
+        return _fetch_current(FORECAST_URL, lat, lon, _FORECAST_FIELDS)
+    except Exception as e:
+        log.error("Weather API error: %s", e)
+    return {}
+
+def _round_coords(lat, lon):
+    # 2 decimals is ~1 km - well inside one Open-Meteo grid cell
+    return round(lat, 2), round(lon, 2)
+
+@ttl_cache(900, normalize=_round_coords)  # Open-Meteo "current" values update hourly at best
 def fetch_weather(lat, lon):
     """
     Fetch current weather from Open-Meteo API (free, no key required).
+    The marine and forecast endpoints are independent, so both are called at once.
     Returns dict with water_temp_c, air_temp_c, wind_speed_kmh, wind_dir
     """
-    try:
-        # Marine API for water temp
-        marine_url = "https://marine-api.open-meteo.com/v1/marine"
-        marine_params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current": "sea_surface_temperature",
-            "timezone": "auto"
-        }
-
-        # Weather API for air temp and wind
-        weather_url = "https://api.open-meteo.com/v1/forecast"
-        weather_params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current": "temperature_2m,wind_speed_10m,wind_direction_10m",
-            "timezone": "auto"
-        }
-
-        result = {
-            "water_temp_c": None,
-            "air_temp_c": None,
-            "wind_speed_kmh": None,
-            "wind_dir": None
-        }
-
-        # Fetch marine data (water temp)
-        try:
-            r = requests.get(marine_url, params=marine_params, timeout=10)
-            data = r.json()
-            if "current" in data:
-                result["water_temp_c"] = data["current"].get("sea_surface_temperature")
-        except Exception as e:
-            print(f"Marine API error: {e}")
-
-        # Fetch weather data (air temp, wind)
-        try:
-            r = requests.get(weather_url, params=weather_params, timeout=10)
-            data = r.json()
-            if "current" in data:
-                result["air_temp_c"] = data["current"].get("temperature_2m")
-                result["wind_speed_kmh"] = data["current"].get("wind_speed_10m")
-                result["wind_dir"] = data["current"].get("wind_direction_10m")
-        except Exception as e:
-            print(f"Weather API error: {e}")
+    result = {
+        "water_temp_c": None,
+        "air_temp_c": None,
+        "wind_speed_kmh": None,
+        "wind_dir": None
+    }
+    for part in gather(lambda: _fetch_marine(lat, lon), lambda: _fetch_forecast(lat, lon)):
+        result.update(part)
 
-        return result
-    except Exception as e:
-        print(f"Weather fetch error: {e}")
+    # Both calls failed - return None so the miss isn't cached
+    if all(v is None for v in result.values()):
         return None
+    return result
+
+def beach_weather(code):
+    """fetch_weather for a BEACH_LOCATIONS code, None if it has no coordinates"""
+    loc = BEACH_LOCATIONS.get(code, {})
+    lat, lon = loc.get("lat"), loc.get("lon")
+    return fetch_weather(lat, lon) if lat and lon else None
+
+# Compass point for each whole degree
+_DIR_LUT = tuple(("N", "NE", "E", "SE", "S", "SW", "W", "NW")[round(d / 45) % 8] for d in range(360))
 
 def wind_direction_text(degrees):
     """Convert wind direction degrees to compass direction"""
     if degrees is None:
         return ""
-    dirs = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
-    idx = round(degrees / 45) % 8
-    return dirs[idx]
+    return _DIR_LUT[round(degrees) % 360]
 
 # ============== NOAA TIDES API ==============
 
+NOAA_URL = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
+
 def fetch_tides(station_key):
     """
     Fetch today's tide predictions from NOAA CO-OPS API.
@@ -334,7 +668,6 @@ def fetch_tides(station_key):
     station_id = NOAA_STATIONS[station_key]
     today = datetime.now(TZ).strftime("%Y%m%d")
 
-    url = "https://api.tidesandcurrents.noaa.gov/api/prod/datagetter"
     params = {
         "station": station_id,
         "product": "predictions",
@@ -348,11 +681,11 @@ def fetch_tides(station_key):
     }
 
     try:
-        r = requests.get(url, params=params, timeout=10)
+        r = SESSION.get(NOAA_URL, params=params, timeout=10)
         data = r.json()
 
         if "predictions" not in data:
-            print(f"NOAA API error: {data.get('error', 'Unknown error')}")
+            log.error("NOAA API error: %s", data.get('error', 'Unknown error'))
             return None
 
         tides = []
@@ -362,9 +695,10 @@ def fetch_tides(station_key):
             height = float(pred.get("v", 0))
             tide_type = "High" if pred.get("type") == "H" else "Low"
 
-            # Convert to 12-hour format
+            # Convert to 12-hour format (fromisoformat is a C fast path;
+            # strptime goes through the locale-aware regex machinery)
             try:
-                dt = datetime.strptime(time_str, "%Y-%m-%d %H:%M")
+                dt = datetime.fromisoformat(time_str)
                 time_fmt = dt.strftime("%I:%M %p").lstrip("0")
             except:
                 time_fmt = time_str
@@ -377,7 +711,7 @@ def fetch_tides(station_key):
 
         return tides
     except Exception as e:
-        print(f"NOAA tide fetch error: {e}")
+        log.error("NOAA tide fetch error: %s", e)
         return None
 
 
@@ -395,27 +729,129 @@ def format_tides(tides):
 
 # ============== SCRAPING ==============
 
-def meters_to_feet(m):
+HTML_PARSER = "lxml"  # C-backed, several times faster than "html.parser"
+
+# Only build the parts of the page we read - skips nav, ads and footer markup
+_TABLES_ONLY = SoupStrainer("table")
+
+# Compression needs no header here: requests already advertises urllib3's
+# encodings, br included once brotli is installed
+_HTML_HEADERS = {"Accept": "text/html"}
+
+# Compiled once - these run per cell over the whole forecast table
+_FLOAT_RE = re.compile(r"\d*\.?\d+")  # always float()-able
+_INT_RE = re.compile(r"\d+")
+_BREAKS_HREF_RE = re.compile(r"/breaks/")
+_STAR_SRC_RE = re.compile(r"star")
+_RATING_CLASS_RE = re.compile(r"rating|star", re.I)
+_JSON_ARRAY_RE = re.compile(r"\[[\d.,\s]+\]")
+
+# Water temp - tried in order
+_TEMP_RES = [re.compile(p, re.I) for p in (
+    r"water[:\s]+(\d+\.?\d*)\s*°?\s*C",
+    r"(\d+\.?\d*)\s*°\s*C.*water",
+    r"sea[:\s]+(\d+\.?\d*)\s*°?\s*C",
+    r"temperature[:\s]+(\d+\.?\d*)\s*°?\s*C",
+)]
+
+def _first_numbers(pattern, values, cast):
+    """First regex match in each value converted with cast, or 0 when there is none"""
+    return [cast(m.group()) if (m := pattern.search(v)) else cast(0) for v in values]
+
+_WAVE_KEYS = ("waveHeight", "wave_height")
+_SCRIPT_WINDOW = 4096
+
+def _script_wave_heights(html):
+    """Pull wave heights from the JSON embedded in the page's scripts.
+    Scans a window after the first waveHeight key rather than parsing scripts."""
+    hits = [i for i in (html.find(k) for k in _WAVE_KEYS) if i != -1]
+    if not hits:
+        return []
+    idx = min(hits)
+    # Start at the key - anything before it belongs to other data or markup
+    match = _JSON_ARRAY_RE.search(html, idx, idx + _SCRIPT_WINDOW)
+    if not match:
+        return []
     try:
-        return round(float(m) * 3.28)
+        return [float(w) for w in json.loads(match.group())[:21]]
     except:
-        return 0
+        return []
+
+FEET_PER_METER = 3.28
 
+# data-row-name attribute -> fetch_spot field
+_ROW_NAME_FIELDS = {
+    "rating": "ratings",
+    "wave-height": "waves_m",
+    "period": "periods",
+    "periods": "periods",
+    "wind-state": "wind_states",
+}
+_ROW_FIELDS = ("ratings", "waves_m", "periods", "wind_states")
+
+def _row_values(row):
+    """Cell values for one forecast row (7 days × 3 periods)"""
+    values = []
+    for cell in row.find_all("td")[:21]:
+        # Check for star ratings (images or data attributes)
+        stars = cell.find_all("img", src=_STAR_SRC_RE)
+        if stars:
+            values.append(str(len(stars)))
+            continue
+
+        # Check for data-rating attribute
+        rating_attr = cell.get("data-rating") or cell.get("data-value")
+        if rating_attr:
+            values.append(rating_attr)
+            continue
+
+        # Fall back to text content
+        values.append(cell.get_text().strip())
+    return values
+
+def _store_row(data, field, row):
+    values = _row_values(row)
+    if not values:
+        return
+    # Numeric rows are converted as they're matched, not re-parsed later
+    if field == "waves_m":
+        values = _first_numbers(_FLOAT_RE, values, float)
+    elif field == "periods":
+        values = _first_numbers(_INT_RE, values, int)
+    data[field] = values
+
+def parse_rating(value):
+    try:
+        return int(value)
+    except:
+        return -1
+
+@ttl_cache(6 * 3600)  # surf-forecast.com updates roughly every 6h
 def fetch_spot(slug):
     """Fetch 7-day forecast from surf-forecast.com"""
     url = f"https://www.surf-forecast.com/breaks/{slug}/forecasts/latest/six_day"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
 
     try:
-        r = requests.get(url, headers=headers, timeout=15)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r = SESSION.get(url, headers=_HTML_HEADERS, timeout=15)
+        r.raise_for_status()
+        # Response.text re-decodes (and may re-sniff the charset) on every
+        # access, so decode once and reuse it for the parse and the regexes
+        html = r.text
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=_TABLES_ONLY)
 
         data = {"ratings": [], "waves_m": [], "periods": [], "wind_states": [], "water_temp_c": None}
 
-        # Try new structure - look for forecast table
-        forecast_table = soup.find("table", class_="forecast-table") or soup.find("table")
+        # Fast path - rows tagged with data-row-name, one selector pass
+        for row in soup.select("tr[data-row-name]"):
+            field = _ROW_NAME_FIELDS.get(row["data-row-name"])
+            if field:
+                _store_row(data, field, row)
+        tagged = {f for f in _ROW_FIELDS if data[f]}
+
+        # Fallback - look for forecast table, and only walk its rows
+        forecast_table = None
+        if len(tagged) < len(_ROW_FIELDS):
+            forecast_table = soup.select_one("table.forecast-table") or soup.find("table")
 
         if forecast_table:
             rows = forecast_table.find_all("tr")
@@ -426,90 +862,66 @@ def fetch_spot(slug):
                     continue
 
                 label = header.get_text().strip().lower()
-                cells = row.find_all("td")
-
-                if not cells:
-                    continue
-
-                # Extract values from cells
-                values = []
-                for cell in cells[:21]:  # 7 days × 3 periods
-                    # Check for star ratings (images or data attributes)
-                    stars = cell.find_all("img", src=re.compile(r"star"))
-                    if stars:
-                        values.append(str(len(stars)))
-                        continue
-
-                    # Check for data-rating attribute
-                    rating_attr = cell.get("data-rating") or cell.get("data-value")
-                    if rating_attr:
-                        values.append(rating_attr)
-                        continue
-
-                    # Fall back to text content
-                    text = cell.get_text().strip()
-                    values.append(text)
-
                 if "rating" in label or "star" in label:
-                    data["ratings"] = values
+                    field = "ratings"
                 elif "wave" in label and ("height" in label or "size" in label or "(m)" in label):
-                    data["waves_m"] = [re.search(r"[\d.]+", v).group() if re.search(r"[\d.]+", v) else "0" for v in values]
+                    field = "waves_m"
                 elif "period" in label:
-                    data["periods"] = [re.search(r"\d+", v).group() if re.search(r"\d+", v) else "0" for v in values]
+                    field = "periods"
                 elif "wind" in label and "state" in label:
-                    data["wind_states"] = values
+                    field = "wind_states"
+                else:
+                    continue
+
+                if field not in tagged:
+                    _store_row(data, field, row)
 
         # Alternative: Try to find rating elements by class
         if not data["ratings"]:
-            rating_elements = soup.find_all(class_=re.compile(r"rating|star", re.I))
+            rating_elements = soup.find_all(class_=_RATING_CLASS_RE)
             for elem in rating_elements:
                 # Look for numeric rating
                 text = elem.get_text().strip()
                 if text.isdigit() and len(text) == 1:
                     data["ratings"].append(text)
 
-        # Alternative: Find wave data in script tags or JSON
+        # Alternative: Find wave data in embedded script JSON
         if not data["waves_m"]:
-            scripts = soup.find_all("script")
-            for script in scripts:
-                if script.string and ("waveHeight" in script.string or "wave_height" in script.string):
-                    # Try to extract JSON data
-                    match = re.search(r'\[[\d.,\s]+\]', script.string)
-                    if match:
-                        try:
-                            waves = json.loads(match.group())
-                            data["waves_m"] = [str(w) for w in waves[:21]]
-                        except:
-                            pass
-
-        data["waves_ft"] = [meters_to_feet(m) for m in data["waves_m"]]
+            data["waves_m"] = _script_wave_heights(html)
+
+        # Nothing parsed (block page, layout change) - return None so
+        # ttl_cache doesn't hold on to an empty forecast
+        if not data["ratings"] and not data["waves_m"]:
+            log.error("Error fetching %s: no forecast rows found", slug)
+            return None
+
+        data["waves_ft"] = [round(m * FEET_PER_METER) for m in data["waves_m"]]
+
+        # Ratings parsed once, aligned with data["ratings"].
+        # -1 marks a rating cell that is not a number.
+        data["ratings_int"] = [parse_rating(v) for v in data["ratings"]]
 
         # Water temp - try multiple patterns
-        temp_patterns = [
-            r"water[:\s]+(\d+\.?\d*)\s*°?\s*C",
-            r"(\d+\.?\d*)\s*°\s*C.*water",
-            r"sea[:\s]+(\d+\.?\d*)\s*°?\s*C",
-            r"temperature[:\s]+(\d+\.?\d*)\s*°?\s*C",
-        ]
-        for pattern in temp_patterns:
-            temp_match = re.search(pattern, r.text, re.I)
+        for pattern in _TEMP_RES:
+            temp_match = pattern.search(html)
             if temp_match:
                 data["water_temp_c"] = float(temp_match.group(1))
                 break
 
         return data
     except Exception as e:
-        print(f"Error fetching {slug}: {e}")
+        log.error("Error fetching %s: %s", slug, e)
         return None
 
+@ttl_cache(1800)
 def fetch_county_rankings():
     """Get current ratings for all LA County spots"""
     url = "https://www.surf-forecast.com/regions/Los-Angeles-County"
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; SurfBot/1.0)"}
 
     try:
-        r = requests.get(url, headers=headers, timeout=15)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r = SESSION.get(url, headers=_HTML_HEADERS, timeout=15)
+        r.raise_for_status()
+        soup = BeautifulSoup(r.text, HTML_PARSER, parse_only=_TABLES_ONLY)
 
         spots = []
         for row in soup.find_all("tr"):
@@ -517,7 +929,7 @@ def fetch_county_rankings():
             if len(cells) < 4:
                 continue
 
-            link = row.find("a", href=re.compile(r"/breaks/"))
+            link = row.find("a", href=_BREAKS_HREF_RE)
             if not link:
                 continue
 
@@ -534,11 +946,17 @@ def fetch_county_rankings():
         spots.sort(key=lambda x: x["rating"], reverse=True)
         return spots
     except Exception as e:
-        print(f"Error fetching county: {e}")
+        log.error("Error fetching county: %s", e)
         return []
 
 # ============== FORMATTING ==============
 
+# Header rules - built once rather than on every report
+_HRULE_24 = "━" * 24
+_HRULE_28 = "━" * 28
+
+# Only a handful of distinct wind-state strings exist, so remember each one
+@functools.lru_cache(maxsize=32)
 def wind_text(state):
     """Plain English wind states"""
     s = (state or "").lower()
@@ -546,163 +964,199 @@ def wind_text(state):
         return "calm"
     elif "cross" in s and "on" not in s:
         return "light wind"
-    else:
-        return "windy"
+    return "windy"
 
-def get_day_names():
-    """Day names starting from today"""
-    now = datetime.now(TZ)
-    names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    today_idx = now.weekday()
-    return [names[(today_idx + i) % 7] for i in range(7)]
+DAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
 
-def find_best_windows(data, days):
-    """Find best weekend and weekday windows"""
-    weekend_best = {"day": None, "per": "AM", "rating": -1, "height": 0, "period": "0", "wind": ""}
-    pto_worthy = []
-
-    for i, day in enumerate(days[:7]):
-        for p, per_name in enumerate(["AM", "PM"]):
+def get_day_layout(now=None):
+    """
+    Day names starting from today, plus which of those positions are
+    weekend vs weekday days: (names, weekend_idx, weekday_idx)
+    """
+    now = now or datetime.now(TZ)
+    return _day_layout(now.weekday())
+
+@functools.lru_cache(maxsize=7)
+def _day_layout(today):
+    """The layout only depends on today's weekday, so there are just 7"""
+    order = [(today + i) % 7 for i in range(7)]
+    names = tuple(DAY_NAMES[d] for d in order)
+    weekend_idx = tuple(i for i, d in enumerate(order) if d >= 5)
+    weekday_idx = tuple(i for i, d in enumerate(order) if d < 5)
+    return names, weekend_idx, weekday_idx
+
+class Slot(NamedTuple):
+    """One AM/PM forecast cell, normalized for the report builders"""
+    day: str
+    per: str
+    rating: int  # -1 when the cell has no numeric rating
+    height: object  # feet, "?" when missing
+    period: object  # seconds, "?" when missing
+    wind: str
+    is_weekend: bool
+
+_NO_SLOT = Slot(None, "AM", -1, 0, 0, "", True)
+
+def _rating_text(slot):
+    return slot.rating if slot.rating >= 0 else "?"
+
+def _slots(data, days, weekend_idx):
+    """AM and PM slots for each day that has a rating cell - one pass over the grid"""
+    ratings, waves, periods, winds = data["ratings_int"], data["waves_ft"], data["periods"], data["wind_states"]
+    listed = len(data["ratings"])
+    slots = []
+    for i, day in enumerate(days):
+        for p, per_name in enumerate(("AM", "PM")):
             idx = i * 3 + p
-            if idx >= len(data.get("ratings", [])):
-                continue
-
-            try:
-                rating = int(data["ratings"][idx])
-            except:
+            if idx >= listed:
                 continue
-
-            height = data["waves_ft"][idx] if idx < len(data["waves_ft"]) else 0
-            period = data["periods"][idx] if idx < len(data["periods"]) else "0"
-            wind = wind_text(data["wind_states"][idx] if idx < len(data["wind_states"]) else "")
-
-            entry = {"day": day, "per": per_name, "rating": rating, "height": height, "period": period, "wind": wind}
-
-            if day in ["Sat", "Sun"]:
-                if rating > weekend_best["rating"]:
-                    weekend_best = entry
-            else:
-                if rating >= WEEKDAY_PTO_THRESHOLD:
-                    pto_worthy.append(entry)
-
+            slots.append(Slot(
+                day, per_name, ratings[idx],
+                waves[idx] if idx < len(waves) else "?",
+                periods[idx] if idx < len(periods) else "?",
+                wind_text(winds[idx] if idx < len(winds) else ""),
+                i in weekend_idx,
+            ))
+    return slots
+
+def find_best_windows(slots):
+    """Find best weekend and weekday windows"""
+    weekend_best = max((s for s in slots if s.is_weekend and s.rating >= 0),
+                       key=lambda s: s.rating, default=_NO_SLOT)
+    pto_worthy = [s for s in slots if not s.is_weekend and s.rating >= WEEKDAY_PTO_THRESHOLD]
     return weekend_best, pto_worthy
 
 def generate_explainer(weekend_best, pto_worthy):
     """Plain English summary"""
     lines = []
 
-    if weekend_best["rating"] >= 3:
-        lines.append(f"{weekend_best['day']} {weekend_best['per']} is your weekend play - {weekend_best['height']}ft at {weekend_best['period']}s, {weekend_best['wind']}.")
-    elif weekend_best["rating"] >= 1:
-        lines.append(f"Weekend is weak. Best is {weekend_best['day']} {weekend_best['per']} at ⭐{weekend_best['rating']}.")
+    if weekend_best.rating >= 3:
+        lines.append(f"{weekend_best.day} {weekend_best.per} is your weekend play - {weekend_best.height}ft at {weekend_best.period}s, {weekend_best.wind}.")
+    elif weekend_best.rating >= 1:
+        lines.append(f"Weekend is weak. Best is {weekend_best.day} {weekend_best.per} at ⭐{weekend_best.rating}.")
     else:
         lines.append("Weekend is flat. Maybe next week.")
 
     if pto_worthy:
-        top = max(pto_worthy, key=lambda x: x["rating"])
-        if top["rating"] > weekend_best["rating"] + 1:
-            lines.append(f"\nBut {top['day']} {top['per']} is worth PTO - {top['height']}ft at {top['period']}s, {top['wind']}. Much better than the weekend.")
+        top = max(pto_worthy, key=lambda x: x.rating)
+        if top.rating > weekend_best.rating + 1:
+            lines.append(f"\nBut {top.day} {top.per} is worth PTO - {top.height}ft at {top.period}s, {top.wind}. Much better than the weekend.")
 
     return "\n".join(lines)
 
 # ============== REPORTS ==============
 
-def daily_report():
-    """7-day report with weekend priority"""
-    now = datetime.now(TZ)
-    days = get_day_names()
+@dataclass
+class SurfState:
+    """Forecasts from the last daily report, reused by the hourly blast"""
+    forecasts: dict = field(default_factory=dict)  # slug -> fetch_spot data
+    rankings: list = field(default_factory=list)
+    fetched_at: datetime = None
 
-    msg = f"🏄 <b>Surf Report</b>\n{now.strftime('%A %b %d')}\n" + "━" * 24 + "\n\n"
+    def is_fresh(self, now, max_age=3600):
+        return self.fetched_at is not None and (now - self.fetched_at).total_seconds() < max_age
 
-    for spot in SPOTS:
-        data = fetch_spot(spot["slug"])
-        if not data or not data.get("waves_ft"):
-            msg += f"<b>{spot['name']}</b>\n⚠️ Data unavailable\n\n"
-            continue
+# Replaced wholesale (never mutated) so readers on other threads see a consistent snapshot
+STATE = SurfState()
 
-        msg += f"<b>📍 {spot['name']}</b>\n\n"
+def daily_report(force=False):
+    """7-day report with weekend priority. force=True skips cached forecasts."""
+    now = datetime.now(TZ)
+    days, weekend_idx, _ = get_day_layout(now)
 
-        weekend_best, pto_worthy = find_best_windows(data, days)
+    parts = [f"🏄 <b>Surf Report</b>\n{now.strftime('%A %b %d')}\n{_HRULE_24}\n\n"]
 
-        # WEEKEND (detailed)
-        msg += "<b>WEEKEND</b>\n"
-        for i, day in enumerate(days[:7]):
-            if day not in ["Sat", "Sun"]:
-                continue
+    # Scrape all spots at once rather than one after another
+    fetch = functools.partial(fetch_spot, force=force)
+    forecasts = fan_out(fetch, [(spot["slug"],) for spot in SPOTS])
 
-            for p, per_name in enumerate(["AM", "PM"]):
-                idx = i * 3 + p
-                if idx >= len(data.get("ratings", [])):
-                    continue
+    for spot, data in zip(SPOTS, forecasts):
+        if not data or not data.get("waves_ft"):
+            parts.append(f"<b>{spot['name']}</b>\n⚠️ Data unavailable\n\n")
+            continue
 
-                height = data["waves_ft"][idx] if idx < len(data["waves_ft"]) else "?"
-                period = data["periods"][idx] if idx < len(data["periods"]) else "?"
-                rating = data["ratings"][idx] if idx < len(data["ratings"]) else "?"
-                wind = wind_text(data["wind_states"][idx] if idx < len(data["wind_states"]) else "")
+        parts.append(f"<b>📍 {spot['name']}</b>\n\n")
 
-                is_best = (day == weekend_best["day"] and per_name == weekend_best["per"])
-                marker = " 🏆" if is_best else ""
+        slots = _slots(data, days, weekend_idx)
+        weekend_best, pto_worthy = find_best_windows(slots)
 
-                msg += f"{day:3}  {per_name}  {height}ft  {period}s  ⭐{rating}  {wind}{marker}\n"
+        # WEEKEND (detailed)
+        parts.append("<b>WEEKEND</b>\n")
+        for s in slots:
+            if s.is_weekend:
+                marker = " 🏆" if s is weekend_best else ""
+                parts.append(f"{s.day:3}  {s.per}  {s.height}ft  {s.period}s  ⭐{_rating_text(s)}  {s.wind}{marker}\n")
 
         # WEEKDAYS (condensed AM only)
-        msg += "\n<b>WEEKDAYS</b> <i>(PTO worthy?)</i>\n"
-        for i, day in enumerate(days[:7]):
-            if day in ["Sat", "Sun"]:
-                continue
-
-            idx = i * 3  # AM only
-            if idx >= len(data.get("ratings", [])):
-                continue
-
-            height = data["waves_ft"][idx] if idx < len(data["waves_ft"]) else "?"
-            period = data["periods"][idx] if idx < len(data["periods"]) else "?"
-            rating = data["ratings"][idx] if idx < len(data["ratings"]) else "?"
-            wind = wind_text(data["wind_states"][idx] if idx < len(data["wind_states"]) else "")
-
-            try:
-                pto_flag = " ← worth it" if int(rating) >= WEEKDAY_PTO_THRESHOLD else ""
-            except:
-                pto_flag = ""
-
-            msg += f"{day}  {height}ft {period}s ⭐{rating} {wind}{pto_flag}\n"
+        parts.append("\n<b>WEEKDAYS</b> <i>(PTO worthy?)</i>\n")
+        for s in slots:
+            if not s.is_weekend and s.per == "AM":
+                pto_flag = " ← worth it" if s.rating >= WEEKDAY_PTO_THRESHOLD else ""
+                parts.append(f"{s.day}  {s.height}ft {s.period}s ⭐{_rating_text(s)} {s.wind}{pto_flag}\n")
 
         # Explainer
         explainer = generate_explainer(weekend_best, pto_worthy)
-        msg += f"\n<i>{explainer}</i>\n"
+        parts.append(f"\n<i>{explainer}</i>\n")
 
         # Water temp (Celsius primary)
         if data.get("water_temp_c"):
             temp_c = data["water_temp_c"]
-            temp_f = c_to_f(temp_c)
-            suit = "full 4/3" if temp_f < 60 else "3/2" if temp_f < 65 else "spring" if temp_f < 70 else "trunks"
-            msg += f"\n🌊 Water: {format_temp(celsius=temp_c)} ({suit})\n"
+            suit = _SURF_SUIT_LABELS[bisect.bisect_right(_SURF_SUIT_THRESHOLDS_F, c_to_f(temp_c))]
+            parts.append(f"\n🌊 Water: {_format_temp_c(temp_c)} ({suit})\n")
 
-        msg += "\n"
+        parts.append("\n")
 
     # County rankings
-    spots = fetch_county_rankings()
+    spots = fetch_county_rankings(force=force)
+
+    # Only a forced run fetched everything just now; otherwise some of this
+    # came from the cache and `now` would overstate how fresh it is
+    global STATE
+    if force:
+        STATE = SurfState(
+            forecasts={spot["slug"]: data for spot, data in zip(SPOTS, forecasts) if data},
+            rankings=spots,
+            fetched_at=now,
+        )
+
     if spots:
         best3 = [s for s in spots[:5] if s["rating"] >= 3]
         if best3:
-            msg += "<b>🏆 Best in LA County</b>\n"
+            parts.append("<b>🏆 Best in LA County</b>\n")
             for s in best3[:3]:
-                msg += f"  {s['name']}: ⭐{s['rating']}\n"
+                parts.append(f"  {s['name']}: ⭐{s['rating']}\n")
 
-    return msg
+    return "".join(parts)
 
-def hourly_top10():
+def hourly_top10(now=None):
     """Master blast: surf + weekend windows + beaches + commute + all options"""
-    now = datetime.now(TZ)
+    now = now or datetime.now(TZ)
+
+    # Reuse what the daily report just scraped when it's under an hour old
+    state = STATE if STATE.is_fresh(now) else SurfState()
+
+    beach_picks = [
+        ("Carp", "carp", "calm, kid-friendly"),
+        ("Belmont", "belmont", "close, easy access"),
+        ("Paradise", "paradise", "scenic, $$$ parking"),
+    ]
+    primary_slug = SPOTS[0]["slug"] if SPOTS else None
+
+    # Every network call for this report goes out at once
+    spots, data, commutes, *weathers = gather(
+        lambda: state.rankings or fetch_county_rankings(),
+        lambda: primary_slug and (state.forecasts.get(primary_slug) or fetch_spot(primary_slug)),
+        lambda: get_commute_times(("carp", "belmont", "paradise")),
+        *[functools.partial(beach_weather, code) for _, code, _ in beach_picks],
+    )
 
-    msg = f"<b>🏄 SurfBot</b>\n{now.strftime('%A %b %d, %I:%M %p')}\n" + "━" * 28 + "\n\n"
+    parts = [f"<b>🏄 SurfBot</b>\n{now.strftime('%A %b %d, %I:%M %p')}\n{_HRULE_28}\n\n"]
 
     # ===== SURF TOP 5 =====
-    spots = fetch_county_rankings()
-    msg += "<b>🌊 SURF NOW (LA County)</b>\n"
+    parts.append("<b>🌊 SURF NOW (LA County)</b>\n")
     if spots:
         for i, s in enumerate(spots[:5], 1):
-            msg += f"{i}. {s['name'][:16]:16} ⭐{s['rating']}\n"
+            parts.append(f"{i}. {s['name']:<16.16} ⭐{s['rating']}\n")
 
         best = spots[0]["rating"]
         if best >= 5:
@@ -713,163 +1167,91 @@ def hourly_top10():
             verdict = "🤷 Meh but rideable"
         else:
             verdict = "❌ Skip surfing today"
-        msg += f"<i>{verdict}</i>\n"
+        parts.append(f"<i>{verdict}</i>\n")
     else:
-        msg += "<i>Data unavailable</i>\n"
+        parts.append("<i>Data unavailable</i>\n")
 
     # ===== WEEKEND WINDOWS (the good stuff) =====
-    msg += "\n<b>📅 WEEKEND WINDOWS</b>\n"
-    days = get_day_names()
-
-    # Get data for primary spot
-    data = fetch_spot(SPOTS[0]["slug"]) if SPOTS else None
+    parts.append("\n<b>📅 WEEKEND WINDOWS</b>\n")
+    days, weekend_idx, _ = get_day_layout(now)
 
     if data and data.get("waves_ft"):
-        weekend_best = {"day": None, "per": None, "rating": -1}
+        slots = _slots(data, days, weekend_idx)
+        weekend_best, _ = find_best_windows(slots)
 
-        for i, day in enumerate(days[:7]):
-            if day not in ["Sat", "Sun"]:
+        for s in slots:
+            if not s.is_weekend:
                 continue
-
-            for p, per_name in enumerate(["AM", "PM"]):
-                idx = i * 3 + p
-                if idx >= len(data.get("ratings", [])):
-                    continue
-
-                height = data["waves_ft"][idx] if idx < len(data["waves_ft"]) else "?"
-                period = data["periods"][idx] if idx < len(data["periods"]) else "?"
-                rating = data["ratings"][idx] if idx < len(data["ratings"]) else "?"
-                wind = wind_text(data["wind_states"][idx] if idx < len(data["wind_states"]) else "")
-
-                try:
-                    r = int(rating)
-                    if r > weekend_best["rating"]:
-                        weekend_best = {"day": day, "per": per_name, "rating": r}
-                except:
-                    pass
-
-                is_best = (day == weekend_best["day"] and per_name == weekend_best["per"])
-                is_now = (day == days[0] and
-                         ((per_name == "AM" and now.hour < 12) or
-                          (per_name == "PM" and now.hour >= 12)))
-
-                marker = ""
-                if is_best and is_now:
-                    marker = " ← NOW 🏆"
-                elif is_best:
-                    marker = " 🏆"
-                elif is_now:
-                    marker = " ← NOW"
-
-                msg += f"{day} {per_name}  {height}ft {period}s ⭐{rating} {wind}{marker}\n"
+            is_best = s is weekend_best
+            is_now = (s.day == days[0] and
+                     ((s.per == "AM" and now.hour < 12) or
+                      (s.per == "PM" and now.hour >= 12)))
+
+            marker = ""
+            if is_best and is_now:
+                marker = " ← NOW 🏆"
+            elif is_best:
+                marker = " 🏆"
+            elif is_now:
+                marker = " ← NOW"
+
+            parts.append(f"{s.day} {s.per}  {s.height}ft {s.period}s ⭐{_rating_text(s)} {s.wind}{marker}\n")
     else:
-        msg += "<i>Forecast unavailable</i>\n"
+        parts.append("<i>Forecast unavailable</i>\n")
 
     # ===== BEACHES (with real temps) =====
-    msg += "\n<b>🏖 BEACHES</b>\n"
-    beach_picks = [
-        ("Carp", "carp", "calm, kid-friendly"),
-        ("Belmont", "belmont", "close, easy access"),
-        ("Paradise", "paradise", "scenic, $$$ parking"),
-    ]
-    for name, code, note in beach_picks:
-        loc = BEACH_LOCATIONS.get(code, {})
-        lat, lon = loc.get("lat"), loc.get("lon")
-        if lat and lon:
-            weather = fetch_weather(lat, lon)
-            if weather and weather.get("water_temp_c"):
-                temp = format_temp(celsius=weather["water_temp_c"])
-            else:
-                temp = "?"
-        else:
-            temp = "?"
-        msg += f"{name}: {temp} - {note}\n"
+    parts.append("\n<b>🏖 BEACHES</b>\n")
+    for (name, code, note), weather in zip(beach_picks, weathers):
+        temp = _weather_temp(weather, "water_temp_c")
+        parts.append(f"{name}: {temp} - {note}\n")
 
     # ===== COMMUTE TIMES =====
-    commutes = get_commute_times(["carp", "belmont", "paradise"])
     if commutes:
-        msg += "\n<b>🚗 DRIVE</b> <i>(from Glendale)</i>\n"
+        parts.append("\n<b>🚗 DRIVE</b> <i>(from Glendale)</i>\n")
         names = {"carp": "Carp", "belmont": "Belmont", "paradise": "Paradise"}
         for code, times in commutes.items():
             name = names.get(code, code)
-            msg += f"{name:8} → {times['to']:7} back {times['back']}\n"
+            parts.append(f"{name:8} → {times['to']:7} back {times['back']}\n")
 
     # ===== TIMING ADVICE =====
     hour = now.hour
     if hour < 9:
-        msg += "\n<i>🌅 Early window - beat crowds</i>"
+        parts.append("\n<i>🌅 Early window - beat crowds</i>")
     elif hour < 12:
-        msg += "\n<i>☀️ Good time to head out</i>"
+        parts.append("\n<i>☀️ Good time to head out</i>")
     elif hour < 15:
-        msg += "\n<i>🏖 Peak hours - expect crowds</i>"
+        parts.append("\n<i>🏖 Peak hours - expect crowds</i>")
     else:
-        msg += "\n<i>🌇 Winds up, beach clearing out</i>"
+        parts.append("\n<i>🌇 Winds up, beach clearing out</i>")
 
     # ===== SCHOOL BREAK NOTICE =====
-    break_name = is_during_school_break()
+    break_name = is_during_school_break(now)
     if break_name:
-        msg += f"\n<i>📅 {break_name} - kids are off!</i>"
+        parts.append(f"\n<i>📅 {break_name} - kids are off!</i>")
 
     # ===== FOOTER WITH ALL OPTIONS =====
-    msg += "\n\n" + "━" * 28
-    msg += "\n<b>More:</b>"
-    msg += "\n/week - Full 7-day forecast"
-    msg += "\n/local - All your SoCal beaches"
-    msg += "\n/beach spo - Sankt Peter-Ording"
-    msg += "\n/beach van - Vancouver BC"
-    msg += "\n/coast - CA road trip overview"
-    msg += "\n/ - All commands"
-
-    return msg
+    parts.append("\n\n" + _HRULE_28)
+    parts.append(
+        "\n<b>More:</b>"
+        "\n/week - Full 7-day forecast"
+        "\n/local - All your SoCal beaches"
+        "\n/beach spo - Sankt Peter-Ording"
+        "\n/beach van - Vancouver BC"
+        "\n/coast - CA road trip overview"
+        "\n/ - All commands"
+    )
+
+    return "".join(parts)
 
 # ============== BEACH MODE ==============
 
-def local_overview():
-    """Overview of all local SoCal beach favorites"""
-    now = datetime.now(TZ)
+# Static message bodies, built once at import
 
-    msg = f"🏖 <b>Your SoCal Beaches</b>\n{now.strftime('%A %b %d')}\n" + "━" * 24 + "\n\n"
+def _beach_index():
+    travel = [f"• {k} - {v['name']}" for k, v in BEACH_LOCATIONS.items() if v.get("region") == "travel"]
+    local = [f"• {k} - {v['name']}" for k, v in BEACH_LOCATIONS.items() if v.get("region") == "local"]
 
-    local_spots = {k: v for k, v in BEACH_LOCATIONS.items() if v.get("region") == "local"}
-
-    # Group by rough region (south to north)
-    regions = [
-        ("San Diego", ["fletcher"]),
-        ("Long Beach", ["belmont", "pedro"]),
-        ("Malibu", ["paradise", "piedra"]),
-        ("Ventura", ["oxnard"]),
-        ("Santa Barbara", ["carp", "east"]),
-    ]
-
-    for region_name, codes in regions:
-        msg += f"<b>{region_name}</b>\n"
-        for code in codes:
-            if code in local_spots:
-                spot = local_spots[code]
-                lat, lon = spot.get("lat"), spot.get("lon")
-                if lat and lon:
-                    weather = fetch_weather(lat, lon)
-                    if weather and weather.get("water_temp_c"):
-                        temp = format_temp(celsius=weather["water_temp_c"])
-                    else:
-                        temp = "?"
-                else:
-                    temp = "?"
-                msg += f"  {spot['name'][:18]:18} 💧{temp}\n"
-        msg += "\n"
-
-    msg += "<i>Use /beach [code] for details:\npedro, paradise, belmont, fletcher, piedra, oxnard, carp, east</i>"
-
-    return msg
-
-def beach_report(loc_code):
-    """Beach conditions for any destination"""
-    if not loc_code:
-        # Show all available locations
-        travel = [f"• {k} - {v['name']}" for k, v in BEACH_LOCATIONS.items() if v.get("region") == "travel"]
-        local = [f"• {k} - {v['name']}" for k, v in BEACH_LOCATIONS.items() if v.get("region") == "local"]
-
-        return f"""<b>🏖 Beach Locations</b>
+    return f"""<b>🏖 Beach Locations</b>
 
 <b>TRAVEL</b>
 {chr(10).join(travel)}
@@ -882,13 +1264,92 @@ Example: /beach carp
 
 Or /local for SoCal overview"""
 
+_BEACH_INDEX = _beach_index()
+
+_SPO_TEMPLATE = """<b>Wind</b> (for kiting)
+{wind_info}{kite_note}
+
+<b>Tides</b>
+🌊 Check local tide tables
+
+<b>Temps</b>
+💧 Water: {water_temp} - {suit}
+🌡 Air: {air_temp}"""
+
+_VAN_TEMPLATE = """<b>Tides</b> (English Bay)
+🌊 Check local tide tables
+
+<b>Temps</b>
+💧 Water: {water_temp} - {suit}
+🌡 Air: {air_temp}
+
+<b>Spots</b>
+• English Bay - Calm, good swimming
+• Kitsilano - Warmer (shallow)
+• Spanish Banks - Low tide = huge beach"""
+
+_LOCAL_TEMPLATE = """{tide_header}
+{tide_display}
+
+<b>Temps</b>
+💧 Water: {water_temp} - {suit}
+🌡 Air: {air_temp}
+
+<b>Conditions</b>
+🌊 Waves: 1-2ft, gentle
+{wind_info}
+☀️ UV: Bring sunscreen"""
+
+# /local layout, grouped by rough region (south to north). Resolved against
+# BEACH_LOCATIONS once here rather than filtered on every call.
+_LOCAL_REGIONS = tuple(
+    (region_name, tuple(
+        (code, BEACH_LOCATIONS[code]["name"]) for code in codes
+        if BEACH_LOCATIONS.get(code, {}).get("region") == "local"
+    ))
+    for region_name, codes in (
+        ("San Diego", ("fletcher",)),
+        ("Long Beach", ("belmont", "pedro")),
+        ("Malibu", ("paradise", "piedra")),
+        ("Ventura", ("oxnard",)),
+        ("Santa Barbara", ("carp", "east")),
+    )
+)
+_LOCAL_CODES = tuple(code for _, spots in _LOCAL_REGIONS for code, _ in spots)
+
+def local_overview():
+    """Overview of all local SoCal beach favorites"""
+    now = datetime.now(TZ)
+
+    parts = [f"🏖 <b>Your SoCal Beaches</b>\n{now.strftime('%A %b %d')}\n{_HRULE_24}\n\n"]
+
+    # Fetch every beach's weather at once
+    weather_by_code = dict(zip(_LOCAL_CODES, fan_out(beach_weather, [(code,) for code in _LOCAL_CODES])))
+
+    for region_name, spots in _LOCAL_REGIONS:
+        parts.append(f"<b>{region_name}</b>\n")
+        for code, name in spots:
+            weather = weather_by_code[code]
+            temp = _weather_temp(weather, "water_temp_c")
+            parts.append(f"  {name:<18.18} 💧{temp}\n")
+        parts.append("\n")
+
+    parts.append("<i>Use /beach [code] for details:\npedro, paradise, belmont, fletcher, piedra, oxnard, carp, east</i>")
+
+    return "".join(parts)
+
+def beach_report(loc_code):
+    """Beach conditions for any destination"""
+    if not loc_code:
+        return _BEACH_INDEX
+
     if loc_code not in BEACH_LOCATIONS:
         return f"Unknown location: {loc_code}\n\nType /beach for all options."
 
     loc = BEACH_LOCATIONS[loc_code]
     now = datetime.now(TZ)
 
-    msg = f"🏖 <b>{loc['name']}</b>\n{now.strftime('%A %b %d, %I:%M %p')}\n" + "━" * 24 + "\n\n"
+    parts = [f"🏖 <b>{loc['name']}</b>\n{now.strftime('%A %b %d, %I:%M %p')}\n{_HRULE_24}\n\n"]
 
     # Get coordinates for weather lookup
     lat = loc.get("lat")
@@ -900,26 +1361,22 @@ Or /local for SoCal overview"""
     elif loc_code == "van":
         lat, lon = 49.2827, -123.1207  # Vancouver
 
-    # Fetch real weather data
-    weather = fetch_weather(lat, lon) if lat and lon else None
+    # Fetch weather and (for local beaches) tides at the same time
+    tide_station = BEACH_TIDE_STATIONS.get(loc_code)
+    weather, tides = gather(
+        lambda: fetch_weather(lat, lon) if lat and lon else None,
+        lambda: fetch_tides(tide_station) if tide_station else None,
+    )
 
     # Format weather data
-    water_temp = format_temp(celsius=weather["water_temp_c"]) if weather and weather.get("water_temp_c") else "N/A"
-    air_temp = format_temp(celsius=weather["air_temp_c"]) if weather and weather.get("air_temp_c") else "N/A"
+    water_temp = _weather_temp(weather, "water_temp_c", "N/A")
+    air_temp = _weather_temp(weather, "air_temp_c", "N/A")
     wind_speed = weather.get("wind_speed_kmh") if weather else None
     wind_dir = wind_direction_text(weather.get("wind_dir")) if weather else ""
 
     # Wetsuit recommendation based on water temp
     if weather and weather.get("water_temp_c"):
-        temp_c = weather["water_temp_c"]
-        if temp_c < 14:
-            suit = "Full 4/3 wetsuit"
-        elif temp_c < 17:
-            suit = "3/2 wetsuit"
-        elif temp_c < 20:
-            suit = "Spring suit"
-        else:
-            suit = "Trunks OK"
+        suit = _SUIT_LABELS[bisect.bisect_right(_SUIT_THRESHOLDS_C, weather["water_temp_c"])]
     else:
         suit = ""
 
@@ -928,39 +1385,22 @@ Or /local for SoCal overview"""
         wind_info = f"🌬 {wind_speed:.0f} km/h {wind_dir}" if wind_speed else "🌬 Check local conditions"
         kite_note = " - Good for kiting!" if wind_speed and wind_speed > 20 else ""
 
-        msg += f"""<b>Wind</b> (for kiting)
-{wind_info}{kite_note}
-
-<b>Tides</b>
-🌊 Check local tide tables
-
-<b>Temps</b>
-💧 Water: {water_temp} - {suit}
-🌡 Air: {air_temp}"""
+        parts.append(_SPO_TEMPLATE.format(
+            wind_info=wind_info, kite_note=kite_note,
+            water_temp=water_temp, suit=suit, air_temp=air_temp,
+        ))
         if loc.get("note"):
-            msg += f"\n\n<i>⚠️ {loc['note']}</i>"
+            parts.append(f"\n\n<i>⚠️ {loc['note']}</i>")
 
     elif loc_code == "van":
-        msg += f"""<b>Tides</b> (English Bay)
-🌊 Check local tide tables
-
-<b>Temps</b>
-💧 Water: {water_temp} - {suit}
-🌡 Air: {air_temp}
-
-<b>Spots</b>
-• English Bay - Calm, good swimming
-• Kitsilano - Warmer (shallow)
-• Spanish Banks - Low tide = huge beach"""
+        parts.append(_VAN_TEMPLATE.format(water_temp=water_temp, suit=suit, air_temp=air_temp))
 
     # Local SoCal beaches
     else:
         wind_info = f"🌬 {wind_speed:.0f} km/h {wind_dir}" if wind_speed else "🌬 Light breeze"
 
-        # Fetch NOAA tide data for this beach
-        tide_station = BEACH_TIDE_STATIONS.get(loc_code)
+        # NOAA tide data for this beach
         if tide_station:
-            tides = fetch_tides(tide_station)
             tide_display = format_tides(tides)
             station_name = tide_station.replace("_", " ").title()
             tide_header = f"<b>Tides</b> <i>({station_name} station)</i>"
@@ -968,78 +1408,47 @@ Or /local for SoCal overview"""
             tide_display = "Check local tide tables"
             tide_header = "<b>Tides</b>"
 
-        msg += f"""{tide_header}
-{tide_display}
-
-<b>Temps</b>
-💧 Water: {water_temp} - {suit}
-🌡 Air: {air_temp}
-
-<b>Conditions</b>
-🌊 Waves: 1-2ft, gentle
-{wind_info}
-☀️ UV: Bring sunscreen"""
+        parts.append(_LOCAL_TEMPLATE.format(
+            tide_header=tide_header, tide_display=tide_display,
+            water_temp=water_temp, suit=suit, air_temp=air_temp, wind_info=wind_info,
+        ))
 
         if loc.get("note"):
-            msg += f"\n\n<i>💡 {loc['note']}</i>"
-
-    return msg
-
-def coast_overview():
-    """California coast overview for road trips"""
-    now = datetime.now(TZ)
+            parts.append(f"\n\n<i>💡 {loc['note']}</i>")
 
-    msg = f"🚗 <b>California Coast</b>\n{now.strftime('%A %b %d')}\n" + "━" * 24 + "\n\n"
+    return "".join(parts)
 
-    # Fetch real water temps for each region
-    coast_points = [
+# (lat, lon, report line with region and spot already filled in)
+_COAST_POINTS = tuple(
+    (lat, lon, f"<b>{region}</b>\n💧 {{temp}}  |  {spot}\n\n")
+    for region, lat, lon, spot in (
         ("SAN DIEGO", 32.7157, -117.1611, "La Jolla"),
         ("LOS ANGELES", 33.9850, -118.4695, "Malibu"),
         ("SANTA BARBARA", 34.4208, -119.6982, "Rincon"),
         ("CENTRAL COAST", 35.3733, -120.8500, "Morro Bay"),
         ("SAN FRANCISCO", 37.7749, -122.4194, "Ocean Beach"),
-    ]
+    )
+)
 
-    for region, lat, lon, spot in coast_points:
-        weather = fetch_weather(lat, lon)
-        if weather and weather.get("water_temp_c"):
-            temp = format_temp(celsius=weather["water_temp_c"])
-        else:
-            temp = "?"
-        msg += f"<b>{region}</b>\n💧 {temp}  |  {spot}\n\n"
+def coast_overview():
+    """California coast overview for road trips"""
+    now = datetime.now(TZ)
 
-    msg += "<b>Road Trip Verdict:</b>\nCheck individual spots for current conditions."
+    parts = [f"🚗 <b>California Coast</b>\n{now.strftime('%A %b %d')}\n{_HRULE_24}\n\n"]
 
-    return msg
+    # Fetch real water temps for each region, all at once
+    weathers = fan_out(fetch_weather, [(lat, lon) for lat, lon, _ in _COAST_POINTS])
 
-# ============== BOT ==============
+    for (_, _, template), weather in zip(_COAST_POINTS, weathers):
+        parts.append(template.format(temp=_weather_temp(weather, "water_temp_c")))
 
-class Bot:
-    def __init__(self):
-        self.last_update_id = 0
+    parts.append("<b>Road Trip Verdict:</b>\nCheck individual spots for current conditions.")
 
-    def listen(self):
-        while True:
-            try:
-                r = requests.get(
-                    f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/getUpdates",
-                    params={"offset": self.last_update_id + 1, "timeout": 30},
-                    timeout=35
-                )
-                for u in r.json().get("result", []):
-                    self.last_update_id = u["update_id"]
-                    text = u.get("message", {}).get("text", "").lower().strip()
-                    chat = str(u.get("message", {}).get("chat", {}).get("id", ""))
+    return "".join(parts)
 
-                    if chat == TELEGRAM_CHAT_ID:
-                        self.handle(text)
-            except Exception as e:
-                print(f"Listen error: {e}")
-                time.sleep(5)
+# ============== BOT ==============
 
-    def handle(self, text):
-        if text == "/":
-            send("""<b>🏄 SurfBot Commands</b>
+_MENU_TEXT = """<b>🏄 SurfBot Commands</b>
 
 <b>SURF (LA County)</b>
 /surf - Top 10 right now
@@ -1056,33 +1465,9 @@ Local: pedro, paradise, belmont, fletcher, piedra, oxnard, carp, east
 
 <b>INFO</b>
 /help - How to read reports
-/ping - Health check""")
-
-        elif text in ["/surf", "/now"]:
-            msg = hourly_top10()
-            if msg:
-                send(msg)
-
-        elif text in ["/week", "/forecast"]:
-            send(daily_report())
-
-        elif text == "/local":
-            send(local_overview())
-
-        elif text.startswith("/beach"):
-            parts = text.split()
-            loc = parts[1] if len(parts) > 1 else None
-            msg = beach_report(loc)
-            if msg:
-                send(msg)
-
-        elif text == "/coast":
-            msg = coast_overview()
-            if msg:
-                send(msg)
+/ping - Health check"""
 
-        elif text == "/help":
-            send("""<b>📖 Reading the Reports</b>
+_HELP_TEXT = """<b>📖 Reading the Reports</b>
 
 <b>SURF MODE (LA)</b>
 • Height in feet
@@ -1102,27 +1487,193 @@ Local: pedro, paradise, belmont, fletcher, piedra, oxnard, carp, east
 • Wind speed/direction
 • Air temp
 
-Type / for all commands""")
+Type / for all commands"""
+
+_PING_TEXT = "🏄 SurfBot alive!"
+
+# Commands whose reply never changes
+_STATIC_REPLIES = {"/": _MENU_TEXT, "/help": _HELP_TEXT, "/ping": _PING_TEXT}
+
+def _send_if(msg):
+    if msg:
+        send(msg)
+
+# Command -> handler(arg), arg being the text after the command or None
+_COMMANDS = {
+    "/surf": lambda arg: _send_if(hourly_top10()),
+    "/now": lambda arg: _send_if(hourly_top10()),
+    "/week": lambda arg: send(daily_report()),
+    "/forecast": lambda arg: send(daily_report()),
+    "/local": lambda arg: send(local_overview()),
+    "/beach": lambda arg: _send_if(beach_report(arg and arg.split()[0])),
+    "/coast": lambda arg: _send_if(coast_overview()),
+}
+
+class Bot:
+    def __init__(self):
+        self.last_update_id = 0
+        # Commands run off the polling thread, so a slow /week scrape doesn't
+        # hold up the next getUpdates (or a /ping sent meanwhile)
+        self.commands = ThreadPoolExecutor(max_workers=4, thread_name_prefix="command")
+
+    def dispatch(self, text):
+        def run():
+            try:
+                self.handle(text)
+            except Exception as e:
+                log.exception("Command error (%s): %s", text, e)
+        self.commands.submit(run)
+
+    def process(self, update):
+        """Handle one Telegram update, from either getUpdates or the webhook"""
+        if update["update_id"] <= self.last_update_id:
+            return  # Already seen - a webhook redelivery (delivery is in order, see serve_webhook)
+        self.last_update_id = update["update_id"]
+        msg = update.get("message")
+        if not msg or msg.get("chat", {}).get("id") != _AUTH_CHAT_ID:
+            return
+        text = msg.get("text")
+        if text:
+            self.dispatch(text.lower().strip())
 
-        elif text == "/ping":
-            send("🏄 SurfBot alive!")
+    def listen(self):
+        # getUpdates is refused (409) while a webhook from an earlier
+        # webhook-mode run is still registered
+        try:
+            SESSION.post(_TG_DELETE_WEBHOOK_URL, timeout=TELEGRAM_SEND_TIMEOUT)
+        except Exception as e:
+            log.error("deleteWebhook error: %s", e)
+
+        failures = 0
+        while True:
+            try:
+                # Long-poll for up to 50s; only message updates are sent back
+                r = SESSION.get(
+                    _TG_UPDATES_URL,
+                    params={
+                        "offset": self.last_update_id + 1,
+                        "timeout": 50,
+                        "limit": 100,
+                        "allowed_updates": '["message"]',
+                    },
+                    timeout=TELEGRAM_POLL_TIMEOUT
+                )
+                body = r.content
+                # 401/409/429 etc. - back off like any other failure
+                if r.status_code != 200:
+                    raise RuntimeError(f"getUpdates HTTP {r.status_code}: {body[:200]!r}")
+                failures = 0
+                # Most polls time out with nothing new - skip parsing those
+                if _NO_UPDATES in body[:64]:
+                    continue
+                # json.loads takes the raw bytes, skipping Response.json()'s
+                # encoding sniff and str decode
+                payload = json.loads(body)
+                if not payload.get("ok"):
+                    raise RuntimeError(f"getUpdates failed: {payload.get('description')}")
+                for u in payload.get("result", []):
+                    self.process(u)
+            except Exception as e:
+                log.exception("Listen error: %s", e)
+                # Jitter so a recovering Telegram isn't hit on exact powers of two
+                time.sleep(min(60, 2 ** failures) + random.random())
+                failures += 1
+
+    def serve_webhook(self):
+        """Receive updates pushed by Telegram instead of polling for them"""
+        # Fresh per start; Telegram echoes it back on every push
+        secret = secrets.token_urlsafe(32)
+        bot = self
+
+        class WebhookHandler(BaseHTTPRequestHandler):
+            # The server handles one request at a time, so don't let a peer
+            # that connects and goes quiet hold up Telegram's deliveries
+            timeout = 10
+
+            def do_POST(self):
+                # Compare bytes - compare_digest rejects non-ASCII str, and
+                # headers arrive decoded as latin-1
+                token = self.headers.get("X-Telegram-Bot-Api-Secret-Token", "").encode("latin-1")
+                if not hmac.compare_digest(token, secret.encode()):
+                    self.send_response(403)
+                    self.end_headers()
+                    return
+
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                # Ack first - commands run on the pool, and a slow reply
+                # would make Telegram retry the update
+                self.send_response(200)
+                self.end_headers()
+                try:
+                    bot.process(json.loads(body))
+                except Exception as e:
+                    log.exception("Webhook error: %s", e)
+
+            def log_message(self, format, *args):
+                pass
+
+        # One request at a time keeps update_id ordering simple; handling is just an enqueue
+        server = HTTPServer(("", WEBHOOK_PORT), WebhookHandler)
+        r = SESSION.post(
+            _TG_WEBHOOK_URL,
+            data={
+                "url": WEBHOOK_URL,
+                "secret_token": secret,
+                "allowed_updates": '["message"]',
+                # One connection means in-order delivery, which the
+                # update_id high-water mark in process() relies on
+                "max_connections": 1,
+            },
+            timeout=TELEGRAM_SEND_TIMEOUT
+        )
+        if not r.json().get("ok"):
+            raise RuntimeError(f"setWebhook failed: {r.text}")
+        server.serve_forever()
+
+    def handle(self, text):
+        if text in _STATIC_REPLIES:
+            send(_STATIC_REPLIES[text])
+            return
+
+        # "/beach carp" -> "/beach", "carp"
+        command, _, arg = text.partition(" ")
+        handler = _COMMANDS.get(command)
+        if handler:
+            handler(arg.strip() or None)
 
 # ============== AUTO-PUSH ALERTS ==============
 
-def is_school_break_tomorrow():
+# GUSD_BREAKS parsed once and sorted by start date for bisect lookups
+_BREAKS = sorted(
+    (date.fromisoformat(start), date.fromisoformat(end), name)
+    for start, end, name in GUSD_BREAKS
+)
+_BREAK_STARTS = [b[0] for b in _BREAKS]
+
+def _check_breaks(breaks):
+    """The bisect lookups assume each break ends before the next one starts"""
+    for a, b in zip(breaks, breaks[1:]):
+        if a[1] >= b[0]:
+            raise ValueError(f"GUSD_BREAKS overlap: {a[2]} ({a[0]} to {a[1]}) and {b[2]} ({b[0]} to {b[1]})")
+
+_check_breaks(_BREAKS)
+
+def is_school_break_tomorrow(now=None):
     """Check if tomorrow is start of a GUSD break"""
-    tomorrow = (datetime.now(TZ) + timedelta(days=1)).strftime("%Y-%m-%d")
-    for start, end, name in GUSD_BREAKS:
-        if tomorrow == start:
-            return name
+    now = now or datetime.now(TZ)
+    tomorrow = now.date() + timedelta(days=1)
+    i = bisect.bisect_left(_BREAK_STARTS, tomorrow)
+    if i < len(_BREAKS) and _BREAK_STARTS[i] == tomorrow:
+        return _BREAKS[i][2]
     return None
 
-def is_during_school_break():
+def is_during_school_break(now=None):
     """Check if currently in a school break"""
-    today = datetime.now(TZ).strftime("%Y-%m-%d")
-    for start, end, name in GUSD_BREAKS:
-        if start <= today <= end:
-            return name
+    now = now or datetime.now(TZ)
+    today = now.date()
+    i = bisect.bisect_right(_BREAK_STARTS, today) - 1
+    if i >= 0 and today <= _BREAKS[i][1]:
+        return _BREAKS[i][2]
     return None
 
 def weekend_beach_digest():
@@ -1153,14 +1704,14 @@ def weekend_beach_digest():
 
     send(msg)
 
-def school_break_alert():
-    """Evening alert before school breaks"""
+def school_break_alert(now=None):
+    """Evening alert before school breaks - message text, or None"""
     if not SCHOOL_BREAK_ALERTS:
-        return
+        return None
 
-    break_name = is_school_break_tomorrow()
+    break_name = is_school_break_tomorrow(now)
     if not break_name:
-        return
+        return None
 
     msg = f"""📅 <b>Kids Off Tomorrow!</b>
 {break_name} starts
@@ -1174,12 +1725,12 @@ def school_break_alert():
 
 Type /local for all your beaches"""
 
-    send(msg)
+    return msg
 
 def heat_wave_alert():
-    """Alert when hot day forecast for inland"""
+    """Alert when hot day forecast for inland - message text, or None"""
     if not HEAT_WAVE_ALERTS:
-        return
+        return None
 
     # TODO: Fetch real forecast for Glendale from weather API
     # Stub for now - would check tomorrow's forecast
@@ -1195,45 +1746,95 @@ Best pick: Carpinteria - 68°F water
 • Morning fog clears by 10am
 
 <i>Leave early to beat traffic</i>"""
-        send(msg)
+        return msg
+    return None
+
+_ALERT_SEPARATOR = "\n\n―――\n\n"
 
 def check_evening_alerts():
-    """Run evening alert checks (8 PM)"""
-    school_break_alert()
-    # heat_wave_alert()  # Enable when weather API is wired up
+    """Run evening alert checks (8 PM), sent together as one message"""
+    now = datetime.now(TZ)
+    alerts = [
+        school_break_alert(now),
+        # heat_wave_alert(),  # Enable when weather API is wired up
+    ]
+    alerts = [a for a in alerts if a]
+    if alerts:
+        send(_ALERT_SEPARATOR.join(alerts))
 
 # ============== SCHEDULER ==============
 
-def run_scheduler():
-    # Daily surf report at 6 AM
-    schedule.every().day.at(f"{DAILY_HOUR:02d}:00").do(lambda: send(daily_report()))
+def next_daily_run(now, hour, minute=0, weekday=None):
+    """Next hour:minute local time after now, optionally only on a weekday (Mon=0)"""
+    day = now.date()
+    while True:
+        target = datetime.combine(day, dt_time(hour, minute), tzinfo=TZ)
+        if target > now and (weekday is None or day.weekday() == weekday):
+            return target
+        day += timedelta(days=1)
 
-    # Saturday beach digest at 7 AM
-    schedule.every().saturday.at("07:00").do(weekend_beach_digest)
+def next_hourly_run(now, start=0, end=24):
+    """
+    Top of the next hour whose local hour is in [start, end), like a cron
+    hour range (LA offsets are whole hours, so UTC math is exact)
+    """
+    run = now.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    while True:
+        run += timedelta(hours=1)
+        local = run.astimezone(TZ)
+        if start <= local.hour < end:
+            return local
 
-    # Evening alerts at 8 PM (school breaks, heat waves)
-    schedule.every().day.at("20:00").do(check_evening_alerts)
+def run_scheduler():
+    jobs = [
+        # Daily surf report at 6 AM
+        (lambda now: next_daily_run(now, DAILY_HOUR), lambda: send(daily_report(force=True))),
+        # Saturday beach digest at 7 AM
+        (lambda now: next_daily_run(now, 7, weekday=5), weekend_beach_digest),
+        # Evening alerts at 8 PM (school breaks, heat waves)
+        (lambda now: next_daily_run(now, 20), check_evening_alerts),
+        # Hourly surf updates 6 AM - 6 PM
+        (lambda now: next_hourly_run(now, TICKER_START, TICKER_END), hourly_update),
+    ]
 
-    # Hourly surf updates 6 AM - 6 PM
-    schedule.every().hour.at(":00").do(maybe_hourly)
+    now = datetime.now(TZ)
+    pending = [[next_run(now), next_run, job] for next_run, job in jobs]
 
+    # Sleep until the next due job instead of polling. time.sleep runs on the
+    # monotonic clock, so naps are capped at a minute to stay in step with
+    # wall-clock jumps (NTP, host suspend).
     while True:
-        schedule.run_pending()
-        time.sleep(30)
+        entry = min(pending, key=lambda e: e[0])
+        delay = (entry[0] - datetime.now(TZ)).total_seconds()
+        if delay > 0:
+            time.sleep(min(delay, 60))
+            continue
 
-def maybe_hourly():
-    hour = datetime.now(TZ).hour
-    if TICKER_START <= hour < TICKER_END:
-        msg = hourly_top10()
-        if msg:
-            send(msg)
+        _, next_run, job = entry
+        try:
+            job()
+        except Exception as e:
+            log.exception("Scheduler error: %s", e)
+        # Schedule from the current time, so a job overdue by hours runs
+        # once rather than once per missed slot
+        entry[0] = next_run(datetime.now(TZ))
+
+def hourly_update():
+    _send_if(hourly_top10())
 
 def main():
-    print("🏄 SurfBot starting...")
+    log.info("🏄 SurfBot starting...")
+    load_cache()
+    atexit.register(save_cache)
+    # systemd stops us with SIGTERM; exit normally so atexit hooks run
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     now = datetime.now(TZ)
     send(f"🏄 <b>SurfBot Online</b>\n{now.strftime('%I:%M %p')}\n\n/surf - now\n/week - forecast")
     threading.Thread(target=run_scheduler, daemon=True).start()
-    Bot().listen()
+    if WEBHOOK_URL:
+        Bot().serve_webhook()
+    else:
+        Bot().listen()
 
 if __name__ == "__main__":
     main()